@@ -101,14 +101,54 @@ def execute_with_cdr(
             for ``method_replace='gaussian'``.
             - random_state (int): Seed for sampling.
     """
+    return _execute_with_cdr_batch(
+        [circuit],
+        executor,
+        observable,
+        simulator=simulator,
+        num_training_circuits=num_training_circuits,
+        fraction_non_clifford=fraction_non_clifford,
+        fit_function=fit_function,
+        num_fit_parameters=num_fit_parameters,
+        scale_factors=scale_factors,
+        scale_noise=scale_noise,
+        **kwargs,
+    )[0]
+
+
+def _execute_with_cdr_batch(
+    circuits: Sequence[QPROGRAM],
+    executor: Union[Executor, Callable[[QPROGRAM], QuantumResult]],
+    observable: Optional[Observable] = None,
+    *,
+    simulator: Union[Executor, Callable[[QPROGRAM], QuantumResult]],
+    num_training_circuits: int = 10,
+    fraction_non_clifford: float = 0.1,
+    fit_function: Callable[..., float] = linear_fit_function,
+    num_fit_parameters: Optional[int] = None,
+    scale_factors: Sequence[float] = (1,),
+    scale_noise: Callable[[QPROGRAM, float], QPROGRAM] = fold_gates_at_random,
+    **kwargs: Any,
+) -> List[float]:
+    """Returns the CDR estimate of the observable for each circuit in
+    ``circuits``. The arguments are the same as for ``execute_with_cdr``.
+
+    The noisy circuits needed by all the input circuits are sent to the
+    ``executor`` in a single batch, and all the training circuits are sent to
+    the ``simulator`` in a single batch.
+    """
+    if not circuits:
+        return []
+
     # Handle keyword arguments for generating training circuits.
 
     method_select = kwargs.get("method_select", "uniform")
     method_replace = kwargs.get("method_replace", "closest")
     random_state = kwargs.get("random_state", None)
     kwargs_for_training_set_generation = {
-        "sigma_select": kwargs.get("sigma_select"),
-        "sigma_replace": kwargs.get("sigma_replace"),
+        key: kwargs[key]
+        for key in ("sigma_select", "sigma_replace")
+        if kwargs.get(key) is not None
     }
 
     if num_fit_parameters is None:
@@ -128,44 +168,75 @@ def execute_with_cdr(
     if not isinstance(simulator, Executor):
         simulator = Executor(simulator)
 
-    # Check if circuit is already Clifford
-    if is_clifford(circuit):
-        return simulator.evaluate(circuit, observable)[0].real
+    # Circuits which are already Clifford are simulated directly.
+    clifford_indices: List[int] = []
+    indices_to_mitigate: List[int] = []
+    for i, circuit in enumerate(circuits):
+        if is_clifford(circuit):
+            clifford_indices.append(i)
+        else:
+            indices_to_mitigate.append(i)
 
     # Generate training circuits.
-    training_circuits = generate_training_circuits(
-        circuit,
-        num_training_circuits,
-        fraction_non_clifford,
-        method_select,
-        method_replace,
-        random_state,
-        kwargs=kwargs_for_training_set_generation,
+    training_circuits = [
+        generate_training_circuits(
+            circuits[i],
+            num_training_circuits,
+            fraction_non_clifford,
+            method_select,
+            method_replace,
+            random_state,
+            **kwargs_for_training_set_generation,
+        )
+        for i in indices_to_mitigate
+    ]
+
+    mitigated_values: List[float] = [0.0] * len(circuits)
+
+    to_simulate = [circuits[i] for i in clifford_indices] + [
+        c for training in training_circuits for c in training
+    ]
+    results = simulator.evaluate(to_simulate, observable)
+    for i, result in zip(clifford_indices, results):
+        mitigated_values[i] = result.real
+
+    if not indices_to_mitigate:
+        return mitigated_values
+
+    ideal_results = np.array(results[len(clifford_indices) :]).reshape(
+        len(indices_to_mitigate), num_training_circuits
     )
 
     # [Optionally] Scale noise in circuits.
     all_circuits = [
         [scale_noise(c, s) for s in scale_factors]
-        for c in [circuit] + training_circuits  # type: ignore
+        for i, training in zip(indices_to_mitigate, training_circuits)
+        for c in [circuits[i]] + training  # type: ignore
     ]
 
-    to_run = [circuit for circuits in all_circuits for circuit in circuits]
-    all_circuits_shape = (len(all_circuits), len(all_circuits[0]))
+    to_run = [circuit for scaled in all_circuits for circuit in scaled]
+    all_circuits_shape = (
+        len(indices_to_mitigate),
+        num_training_circuits + 1,
+        len(scale_factors),
+    )
 
     results = executor.evaluate(to_run, observable)
     noisy_results = np.array(results).reshape(all_circuits_shape)
 
-    results = simulator.evaluate(training_circuits, observable)
-    ideal_results = np.array(results)
-
     # Do the regression.
-    fitted_params, _ = curve_fit(
-        lambda x, *params: fit_function(x, params),
-        noisy_results[1:, :].T,
-        ideal_results,
-        p0=np.zeros(num_fit_parameters),
-    )
-    return fit_function(noisy_results[0, :], fitted_params)
+    for k, i in enumerate(indices_to_mitigate):
+        fitted_params, _ = curve_fit(
+            lambda x, *params: fit_function(x, params),
+            noisy_results[k, 1:, :].T,
+            ideal_results[k],
+            p0=np.zeros(num_fit_parameters),
+        )
+        mitigated_values[i] = fit_function(
+            noisy_results[k, 0, :], fitted_params
+        )
+
+    return mitigated_values
 
 
 def mitigate_executor(
@@ -254,22 +325,19 @@ def mitigate_executor(
         def new_executor(
             circuits: List[QPROGRAM],
         ) -> List[float]:
-            return [
-                execute_with_cdr(
-                    circuit,
-                    executor,
-                    observable,
-                    simulator=simulator,
-                    num_training_circuits=num_training_circuits,
-                    fraction_non_clifford=fraction_non_clifford,
-                    fit_function=fit_function,
-                    num_fit_parameters=num_fit_parameters,
-                    scale_factors=scale_factors,
-                    scale_noise=scale_noise,
-                    **kwargs,
-                )
-                for circuit in circuits
-            ]
+            return _execute_with_cdr_batch(
+                circuits,
+                executor,
+                observable,
+                simulator=simulator,
+                num_training_circuits=num_training_circuits,
+                fraction_non_clifford=fraction_non_clifford,
+                fit_function=fit_function,
+                num_fit_parameters=num_fit_parameters,
+                scale_factors=scale_factors,
+                scale_noise=scale_noise,
+                **kwargs,
+            )
 
     return new_executor
 
@@ -14,7 +14,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 """Functions for mapping circuits to (near) Clifford circuits."""
-from typing import List, Optional, Sequence, Union, Any, cast
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Union, Any, cast
 
 import numpy as np
 
@@ -74,22 +75,21 @@ def generate_training_circuits(
     if random_state is None or isinstance(random_state, int):
         random_state = np.random.RandomState(random_state)
 
-    # Find the non-Clifford operations in the circuit.
-    operations = np.array(list(circuit.all_operations()))
-    non_clifford_indices_and_ops = np.array(
-        [
-            [i, op]
-            for i, op in enumerate(operations)
-            if not cirq.has_stabilizer_effect(op)
-        ]
-    )
-
-    if len(non_clifford_indices_and_ops) == 0:
+    # Find the non-Clifford operations in the circuit, and where they are.
+    moments = list(circuit)
+    moment_indices: List[int] = []
+    op_indices: List[int] = []
+    non_clifford_ops: List[cirq.ops.Operation] = []
+    for m, moment in enumerate(moments):
+        for k, op in enumerate(moment.operations):
+            if not _is_clifford_op(op):
+                moment_indices.append(m)
+                op_indices.append(k)
+                non_clifford_ops.append(op)
+
+    if len(non_clifford_ops) == 0:
         return [circuit] * num_training_circuits
 
-    non_clifford_indices = np.int32(non_clifford_indices_and_ops[:, 0])
-    non_clifford_ops = non_clifford_indices_and_ops[:, 1]
-
     # Replace (some of) the non-Clifford operations.
     near_clifford_circuits = []
     for _ in range(num_training_circuits):
@@ -101,8 +101,18 @@ def generate_training_circuits(
             random_state,
             **kwargs,
         )
-        operations[non_clifford_indices] = new_ops
-        near_clifford_circuits.append(Circuit(operations))
+
+        # Only rebuild the moments which contain non-Clifford operations.
+        new_moment_ops: Dict[int, List[cirq.ops.Operation]] = {}
+        for m, k, new_op in zip(moment_indices, op_indices, new_ops):
+            if m not in new_moment_ops:
+                new_moment_ops[m] = list(moments[m].operations)
+            new_moment_ops[m][k] = new_op
+
+        new_moments = list(moments)
+        for m, ops in new_moment_ops.items():
+            new_moments[m] = cirq.Moment(ops)
+        near_clifford_circuits.append(Circuit(new_moments))
 
     return near_clifford_circuits
 
@@ -114,9 +124,7 @@ def is_clifford(circuit: Circuit) -> bool:
     Args:
         circuit: A single operation, list of operations, or circuit.
     """
-    return all(
-        cirq.has_stabilizer_effect(op) for op in circuit.all_operations()
-    )
+    return all(_is_clifford_op(op) for op in circuit.all_operations())
 
 
 @accept_any_qprogram_as_input
@@ -127,9 +135,34 @@ def count_non_cliffords(circuit: Circuit) -> int:
     Args:
         circuit: Circuit to count the number of non-Clifford operations in.
     """
-    return sum(
-        not cirq.has_stabilizer_effect(op) for op in circuit.all_operations()
-    )
+    return sum(not _is_clifford_op(op) for op in circuit.all_operations())
+
+
+def _is_clifford_op(op: cirq.ops.Operation) -> bool:
+    """Returns True if the operation is Clifford, else False.
+
+    Args:
+        op: The operation to check.
+    """
+    if op.gate is None:
+        return cirq.has_stabilizer_effect(op)
+    try:
+        return _is_clifford_gate(op.gate)
+    except TypeError:
+        # The gate is unhashable, so it cannot be cached.
+        return cirq.has_stabilizer_effect(op)
+
+
+@lru_cache(maxsize=1024)
+def _is_clifford_gate(gate: cirq.Gate) -> bool:
+    """Returns True if the gate is Clifford, else False. Results are cached
+    since circuits (and repeated calls on the same circuit) typically contain
+    the same few gates many times.
+
+    Args:
+        gate: The gate to check.
+    """
+    return cirq.has_stabilizer_effect(gate)
 
 
 def _map_to_near_clifford(
@@ -180,12 +213,10 @@ def _map_to_near_clifford(
     )
 
     # Return sequence of (near) Clifford operations.
-    return [
-        cast(List[cirq.ops.Operation], clifford_ops).pop(0)
-        if i in indices_of_selected_ops
-        else op
-        for (i, op) in enumerate(non_clifford_ops)
-    ]
+    near_clifford_ops = list(non_clifford_ops)
+    for i, clifford_op in zip(indices_of_selected_ops, clifford_ops):
+        near_clifford_ops[i] = clifford_op
+    return near_clifford_ops
 
 
 def _select(
@@ -211,31 +242,41 @@ def _select(
     if random_state is None:
         random_state = np.random
 
+    if method not in ("uniform", "gaussian"):
+        raise ValueError(
+            f"Arg `method_select` must be 'uniform' or 'gaussian' but was "
+            f"{method}."
+        )
+
     num_non_cliff = len(non_clifford_ops)
-    num_to_replace = int(round(fraction_non_clifford * num_non_cliff))
+    num_to_keep = int(round(fraction_non_clifford * num_non_cliff))
+
+    # If all or none of the operations are selected, there is nothing to
+    # sample.
+    if num_to_keep == 0:
+        return list(range(num_non_cliff))
+    if num_to_keep == num_non_cliff:
+        return []
 
     # Get the distribution for how to select operations.
     if method == "uniform":
         distribution = 1.0 / num_non_cliff * np.ones(shape=(num_non_cliff,))
-    elif method == "gaussian":
+    else:
         non_clifford_angles = np.array(
             [
                 op.gate.exponent * np.pi  # type: ignore
                 for op in non_clifford_ops
             ]
         )
-        probabilities = _angle_to_proximity(non_clifford_angles, sigma)
-        distribution = [k / sum(probabilities) for k in probabilities]
-    else:
-        raise ValueError(
-            f"Arg `method_select` must be 'uniform' or 'gaussian' but was "
-            f"{method}."
+        probabilities = _angle_to_proximity(
+            non_clifford_angles, cast(float, sigma)
         )
+        distribution = probabilities / np.sum(probabilities)
 
     # Select (indices of) non-Clifford operations to replace.
     selected_indices = cast(np.random.RandomState, random_state).choice(
         range(num_non_cliff),
-        num_non_cliff - num_to_replace,
+        num_non_cliff - num_to_keep,
         replace=False,
         p=distribution,
     )
@@ -276,7 +317,7 @@ def _replace(
         [op.gate.exponent * np.pi for op in non_clifford_ops]  # type: ignore
     )
     if method == "closest":
-        clifford_angles = _closest_clifford(non_clifford_angles)
+        clifford_angles = _closest_clifford(non_clifford_angles, random_state)
 
     elif method == "uniform":
         clifford_angles = _random_clifford(
@@ -285,7 +326,9 @@ def _replace(
 
     elif method == "gaussian":
         clifford_angles = _probabilistic_angle_to_clifford(
-            non_clifford_angles, sigma, random_state
+            non_clifford_angles,
+            sigma,
+            cast(np.random.RandomState, random_state),
         )
 
     else:
@@ -313,32 +356,37 @@ def _random_clifford(
         num_angles: Number of Clifford angles to return in array.
         random_state: Random state for sampling.
     """
-    return np.array(
-        [random_state.choice(_CLIFFORD_ANGLES) for _ in range(num_angles)]
-    )
+    return random_state.choice(_CLIFFORD_ANGLES, size=num_angles)
 
 
-@np.vectorize
-def _closest_clifford(angles: np.ndarray) -> float:
+def _closest_clifford(
+    angles: np.ndarray,
+    random_state: Optional[np.random.RandomState] = None,
+) -> np.ndarray:
     """Returns the nearest Clifford angles to the input angles.
 
     Args:
-        non_Clifford_ops: Non-Clifford opperations.
+        angles: Non-Clifford angles.
+        random_state: Random state for choosing between two equidistant
+            Clifford angles.
     """
-    ang_scaled = angles / (np.pi / 2)
-    # if just one min value, return the corresponding nearest cliff.
-    if (
-        abs((ang_scaled / 0.5) - 1) > 10 ** (-6)
-        and abs((ang_scaled / 0.5) - 3) > 10 ** (-6)
-        and (abs((ang_scaled / 0.5) - 5) > 10 ** (-6))
-    ):
-        index = int(np.round(ang_scaled)) % 4
-        return _CLIFFORD_ANGLES[index]
+    angles = np.asarray(angles, dtype=float)
+    ang_scaled = angles.flatten() / (np.pi / 2)
+    indices = np.round(ang_scaled).astype(int) % 4
+
     # If equidistant between two Clifford angles, randomly choose one.
-    else:
-        index_list = [ang_scaled - 0.5, ang_scaled + 0.5]
-        index = int(np.random.choice(index_list))
-        return _CLIFFORD_ANGLES[index]
+    ties = np.any(
+        [abs((ang_scaled / 0.5) - k) <= 10 ** (-6) for k in (1, 3, 5)],
+        axis=0,
+    )
+    if np.any(ties):
+        sampler = cast(
+            np.random.RandomState,
+            np.random if random_state is None else random_state,
+        )
+        shifts = sampler.choice([-0.5, 0.5], size=np.count_nonzero(ties))
+        indices[ties] = (ang_scaled[ties] + shifts).astype(int)
+    return np.array(_CLIFFORD_ANGLES)[indices].reshape(angles.shape)
 
 
 @np.vectorize
@@ -358,32 +406,30 @@ def _is_clifford_angle(
     return False
 
 
-def _angle_to_proximities(angle: np.ndarray, sigma: float) -> List[float]:
+def _angle_to_proximities(angle: np.ndarray, sigma: float) -> np.ndarray:
     """Returns probability distribution based on distance from angles to
     Clifford gates.
 
     Args:
-        angle: angle to form probability distribution.
+        angle: angle(s) to form probability distribution.
 
     Returns:
         discrete value of probability distribution calculated from
         exp(-(diff/sigma)^2) where diff is the distance from each angle and the
-        Clifford gates.
+        Clifford gates. The last axis indexes the Clifford gates I, S, Z, S^3.
     """
-    s_matrix = cirq.unitary(cirq.S)
-    rz_matrix = cirq.unitary(cirq.rz(angle % (2 * np.pi)))
-    # TODO: Update loop / if.
-    dists = []
-    for exponent in range(4):
-        if exponent == 0:
-            exponent = 4
-        diff = np.linalg.norm(rz_matrix - s_matrix**exponent)
-        dists.append(np.exp(-((diff / sigma) ** 2)))
-    return dists
+    # Rz(angle) and the Clifford gates S^k are diagonal, so the Frobenius
+    # norm of their difference only depends on the diagonal entries.
+    half_angle = np.expand_dims(np.asarray(angle) % (2 * np.pi), -1) / 2
+    s_powers = np.exp(0.5j * np.pi * np.arange(4))
+    diffs = np.sqrt(
+        np.abs(np.exp(-1j * half_angle) - 1) ** 2
+        + np.abs(np.exp(1j * half_angle) - s_powers) ** 2
+    )
+    return np.exp(-((diffs / sigma) ** 2))
 
 
-@np.vectorize
-def _angle_to_proximity(angle: np.ndarray, sigma: float) -> float:
+def _angle_to_proximity(angle: np.ndarray, sigma: float) -> np.ndarray:
     """Returns probability distribution based on distance from angles to
     Clifford gates.
 
@@ -396,16 +442,16 @@ def _angle_to_proximity(angle: np.ndarray, sigma: float) -> float:
         sum of distances from each Clifford gate.
     """
     dists = _angle_to_proximities(angle, sigma)
-    return np.max(dists)
+    return np.max(dists, axis=-1)
 
 
-@np.vectorize
 def _probabilistic_angle_to_clifford(
     angles: np.ndarray,
     sigma: float,
     random_state: np.random.RandomState,
-) -> float:
-    """Returns a Clifford angle sampled from the distribution
+) -> np.ndarray:
+    """Returns an array of Clifford angles, one for each input angle, each
+    sampled from the distribution
 
                         prob = exp(-(dist/sigma)^2)
 
@@ -415,11 +461,24 @@ def _probabilistic_angle_to_clifford(
     Args:
         angles: Non-Clifford angles.
         sigma: Width of probability distribution.
-    """
+        random_state: Random state for sampling.
 
+    Raises:
+        ValueError: If the probabilities for some angle are all zero, which
+            happens when ``sigma`` is too small.
+    """
     dists = _angle_to_proximities(angles, sigma)
-
-    cliff_ang = random_state.choice(
-        _CLIFFORD_ANGLES, 1, replace=False, p=np.array(dists) / np.sum(dists)
-    )
-    return cliff_ang
+    normalization = np.sum(dists, axis=-1, keepdims=True)
+    if np.any(normalization == 0):
+        raise ValueError(
+            f"The probabilities of replacing some angles by each Clifford "
+            f"angle are all zero for sigma={sigma}. Use a larger sigma."
+        )
+    probabilities = dists / normalization
+
+    # Inverse transform sampling, one uniform sample per angle.
+    cdf = np.cumsum(probabilities, axis=-1)
+    cdf /= cdf[..., -1:]
+    samples = random_state.random_sample(np.shape(angles))
+    indices = np.sum(cdf <= np.expand_dims(samples, -1), axis=-1)
+    return np.array(_CLIFFORD_ANGLES)[indices]
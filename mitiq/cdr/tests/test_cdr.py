@@ -23,10 +23,11 @@ import numpy as np
 import cirq
 from cirq import LineQubit
 
-from mitiq import PauliString, Observable, QPROGRAM
+from mitiq import Executor, PauliString, Observable, QPROGRAM
 from mitiq._typing import SUPPORTED_PROGRAM_TYPES
 from mitiq.cdr import (
     execute_with_cdr,
+    generate_training_circuits,
     linear_fit_function_no_intercept,
     linear_fit_function,
     mitigate_executor,
@@ -222,6 +223,75 @@ def test_mitigated_execute_with_cdr(
     ]
 
 
+def test_execute_with_cdr_evaluates_circuit_with_training_circuits():
+    circuit = random_x_z_cnot_circuit(
+        LineQubit.range(2), n_moments=5, random_state=1
+    )
+    obs = Observable(PauliString("XZ"), PauliString("YY"))
+    executor = Executor(batched_execute)
+
+    execute_with_cdr(
+        circuit,
+        executor,
+        obs,
+        simulator=simulate,
+        num_training_circuits=5,
+        fraction_non_clifford=0.5,
+        random_state=1,
+    )
+    # The circuit of interest is executed in the same batch as the
+    # training circuits.
+    assert executor.calls_to_executor == 1
+    assert any(
+        np.allclose(cirq.unitary(executed), cirq.unitary(circuit))
+        for executed in executor.executed_circuits
+    )
+
+
+def test_mitigated_batched_executor_runs_single_batch():
+    circuits = [
+        random_x_z_cnot_circuit(
+            LineQubit.range(2), n_moments=5, random_state=random_state
+        )
+        for random_state in (1, 2, 3)
+    ]
+    circuits.append(cirq.Circuit(cirq.H.on_each(*LineQubit.range(2))))
+    obs = Observable(PauliString("XZ"), PauliString("YY"))
+
+    batch_sizes = []
+
+    def counting_batched_execute(circuits) -> List[np.ndarray]:
+        batch_sizes.append(len(circuits))
+        return batched_execute(circuits)
+
+    kwargs = dict(
+        observable=obs,
+        simulator=simulate,
+        num_training_circuits=5,
+        fraction_non_clifford=0.5,
+        random_state=1,
+    )
+    cdr_batched_executor = mitigate_executor(
+        executor=counting_batched_execute, **kwargs
+    )
+    batched_values = cdr_batched_executor(circuits)
+    assert len(batch_sizes) == 1
+
+    serial_values = [
+        execute_with_cdr(circuit, execute, **kwargs) for circuit in circuits
+    ]
+    assert np.allclose(batched_values, serial_values)
+
+
+def test_mitigated_batched_executor_with_no_circuits():
+    cdr_batched_executor = mitigate_executor(
+        executor=batched_execute,
+        observable=Observable(PauliString("XZ")),
+        simulator=simulate,
+    )
+    assert cdr_batched_executor([]) == []
+
+
 @pytest.mark.parametrize("circuit_type", SUPPORTED_PROGRAM_TYPES.keys())
 def test_execute_with_variable_noise_cdr(circuit_type):
     circuit = random_x_z_cnot_circuit(
@@ -268,6 +338,66 @@ def test_mitigate_executor_with_variable_noise_cdr(circuit_type):
     assert abs(mitigated - true_value) <= abs(noisy_value - true_value)
 
 
+def test_execute_with_cdr_runs_identical_training_circuits_once():
+    circuit = random_x_z_cnot_circuit(
+        LineQubit.range(2), n_moments=5, random_state=1
+    )
+    obs = Observable(PauliString("XZ"), PauliString("YY"))
+    simulator = Executor(simulate)
+
+    # With no non-Clifford gates kept and closest replacement, every training
+    # circuit is identical, so the simulator should only be called once.
+    execute_with_cdr(
+        circuit,
+        execute,
+        obs,
+        simulator=simulator,
+        num_training_circuits=10,
+        fraction_non_clifford=0.0,
+        method_replace="closest",
+        random_state=1,
+    )
+    assert simulator.calls_to_executor == 1
+
+
+def test_execute_with_cdr_uses_sigma_kwargs():
+    circuit = random_x_z_cnot_circuit(
+        LineQubit.range(2), n_moments=5, random_state=1
+    )
+    obs = Observable(PauliString("XZ"), PauliString("YY"))
+    simulator = Executor(simulate)
+    kwargs = {
+        "method_select": "gaussian",
+        "method_replace": "gaussian",
+        "sigma_select": 0.2,
+        "sigma_replace": 2.0,
+    }
+
+    execute_with_cdr(
+        circuit,
+        execute,
+        obs,
+        simulator=simulator,
+        num_training_circuits=10,
+        fraction_non_clifford=0.5,
+        random_state=1,
+        **kwargs,
+    )
+    training_circuits = generate_training_circuits(
+        circuit,
+        num_training_circuits=10,
+        fraction_non_clifford=0.5,
+        random_state=1,
+        **kwargs,
+    )
+    unique_training_circuits = list(
+        dict.fromkeys(c.freeze() for c in training_circuits)
+    )
+    assert [c.freeze() for c in simulator.executed_circuits] == (
+        unique_training_circuits
+    )
+
+
 def test_no_num_fit_parameters_with_custom_fit_raises_error():
     with pytest.raises(ValueError, match="Must provide `num_fit_parameters`"):
         execute_with_cdr(
@@ -24,6 +24,7 @@ from mitiq._typing import SUPPORTED_PROGRAM_TYPES
 from mitiq.interface import convert_from_mitiq
 from mitiq.cdr.clifford_training_data import (
     _is_clifford_angle,
+    _is_clifford_gate,
     is_clifford,
     _map_to_near_clifford,
     _select,
@@ -100,6 +101,18 @@ def test_select_some(method):
     assert len(indices) == n // 2
 
 
+@pytest.mark.parametrize("method", ("uniform", "gaussian"))
+def test_select_all_or_none_does_not_sample(method):
+    q = cirq.LineQubit(0)
+    ops = [cirq.ops.rz(0.01).on(q), cirq.ops.rz(-0.77).on(q)]
+    random_state = np.random.RandomState(1)
+    state = random_state.get_state()[1].copy()
+
+    assert _select(ops, 0.0, method, random_state=random_state) == [0, 1]
+    assert _select(ops, 1.0, method, random_state=random_state) == []
+    assert np.array_equal(random_state.get_state()[1], state)
+
+
 def test_select_bad_method():
     with pytest.raises(ValueError, match="Arg `method_select` must be"):
         _select([], fraction_non_clifford=0.0, method="unknown method")
@@ -131,7 +144,7 @@ def test_map_to_near_clifford():
         method_replace="uniform",
         random_state=np.random.RandomState(2),
     )
-    expected_ops = [cirq.rz(np.pi * 1).on(q), cirq.rz(np.pi * 1.5).on(q)]
+    expected_ops = [cirq.rz(np.pi * 0).on(q), cirq.rz(np.pi * 1.5).on(q)]
     assert new_ops == expected_ops
 
 
@@ -192,6 +205,23 @@ def test_generate_training_circuits_mega(
         )
 
 
+def test_generate_training_circuits_preserves_moments():
+    circuit = random_x_z_cnot_circuit(qubits=4, n_moments=10, random_state=1)
+
+    train_circuits = generate_training_circuits(
+        circuit,
+        num_training_circuits=3,
+        fraction_non_clifford=0.5,
+        random_state=np.random.RandomState(1),
+    )
+    for train_circuit in train_circuits:
+        assert len(train_circuit) == len(circuit)
+        for moment, train_moment in zip(circuit, train_circuit):
+            assert moment.qubits == train_moment.qubits
+            if is_clifford(Circuit(moment)):
+                assert train_moment == moment
+
+
 @pytest.mark.parametrize("method", ["uniform", "gaussian"])
 def test_select(method):
     q = cirq.NamedQubit("q")
@@ -229,6 +259,52 @@ def test_count_non_cliffords(circuit_type):
     assert count_non_cliffords(circuit) == 2
 
 
+def test_clifford_classification_is_cached_per_gate():
+    a, b = cirq.LineQubit.range(2)
+    circuit = Circuit(
+        [cirq.H.on(a), cirq.rz(0.3).on(b), cirq.CNOT.on(a, b)] * 10
+    )
+    _is_clifford_gate.cache_clear()
+
+    assert count_non_cliffords(circuit) == 10
+    assert not is_clifford(circuit)
+    assert _is_clifford_gate.cache_info().misses == 3
+
+
+class UnhashableTGate(cirq.Gate):
+    """T gate which defines equality but not hashing."""
+
+    def _num_qubits_(self):
+        return 1
+
+    def _unitary_(self):
+        return cirq.unitary(cirq.T)
+
+    def __eq__(self, other):
+        return isinstance(other, UnhashableTGate)
+
+
+def test_clifford_classification_with_unhashable_gate():
+    a, b = cirq.LineQubit.range(2)
+    circuit = Circuit(
+        cirq.H.on(a),
+        UnhashableTGate().on(a),
+        cirq.rz(0.3).on(b),
+        cirq.CNOT.on(a, b),
+    )
+
+    assert not is_clifford(circuit)
+    assert count_non_cliffords(circuit) == 2
+    assert (
+        len(
+            generate_training_circuits(
+                circuit, num_training_circuits=2, fraction_non_clifford=1.0
+            )
+        )
+        == 2
+    )
+
+
 def test_count_non_cliffords_empty_circuit():
     assert count_non_cliffords(Circuit()) == 0
 
@@ -247,6 +323,19 @@ def test_closest_clifford():
             assert _closest_clifford(a) == ang
 
 
+def test_closest_clifford_equidistant_uses_random_state():
+    # Each angle is equidistant from two Clifford angles.
+    angles = np.array([np.pi / 4, 3 * np.pi / 4, 5 * np.pi / 4] * 10)
+
+    np.random.seed(1)
+    first = _closest_clifford(angles, np.random.RandomState(7))
+    np.random.seed(2)
+    second = _closest_clifford(angles, np.random.RandomState(7))
+
+    assert np.allclose(first, second)
+    assert set(first).issubset(_CLIFFORD_ANGLES)
+
+
 def test_random_clifford():
     assert set(_random_clifford(20, np.random.RandomState(1))).issubset(
         _CLIFFORD_ANGLES
@@ -272,3 +361,10 @@ def test_probabilistic_angles_to_clifford():
             _CLIFFORD_ANGLES, sigma, np.random.RandomState(1)
         )
         assert all(a in _CLIFFORD_ANGLES for a in angles)
+
+
+def test_probabilistic_angles_to_clifford_with_small_sigma():
+    with pytest.raises(ValueError, match="Use a larger sigma"):
+        _probabilistic_angle_to_clifford(
+            np.array([0.1, 2.0]), 0.01, np.random.RandomState(1)
+        )